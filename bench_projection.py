@@ -0,0 +1,142 @@
+# ****************************************************************
+# ランダム射影による次元削減の効果を測定するプログラム
+# 高次元の人工文書データで、元の次元と削減後の次元でk-means法を実行し、
+# 処理時間とクラスタ割り当ての一致度（Rand指数）を比較する
+# 情22-0419 藤里 和輝
+# ****************************************************************
+import random
+import time
+
+from kadai1 import regulateMat, assignDocs
+from projection import randomProjectMat
+
+# 人工の単語文書行列を作成する
+# トピックごとに決めた少数の語彙を優先的に使う文書を生成する
+# (入力) numDoc: 文書数, dim: 語彙数, numTopic: トピック数, numWord: 1文書あたりの単語数, rng: 乱数生成器
+# (出力) wdMat: 単語文書行列, topics: 各文書のトピック番号
+def makeDocuments(numDoc, dim, numTopic, numWord, rng):
+    wdMat=[]
+    topics=[]
+    topicWords=[] # 各トピックでよく使われる語彙
+    for topic in range(numTopic):
+        topicWords.append(rng.sample(range(dim), 50))
+    for i in range(numDoc):
+        topic=rng.randrange(numTopic)
+        vec=[0]*dim
+        for w in range(numWord):
+            if rng.random()<0.5: # 半分はトピックの語彙から選ぶ
+                j=rng.choice(topicWords[topic])
+            else:
+                j=rng.randrange(dim)
+            vec[j]+=1
+        wdMat.append(vec)
+        topics.append(topic)
+    return wdMat, topics
+
+# step 3. 代表点の更新（文書が割り当てられなかったクラスタは前回の代表点のままにする）
+# (入力) wdMat: 単語文書行列, clusters: 各クラスタに割り当てられた文書, prevCenters: 前回の代表点
+# (出力) 更新された代表点
+def updateCenters(wdMat, clusters, prevCenters):
+    k=len(clusters)
+    dim=len(wdMat[0]) # ベクトルの次元数
+    centers=[]
+    for clusterNo in range(k):
+        if len(clusters[clusterNo])==0:
+            centers.append(prevCenters[clusterNo])
+            continue
+        center=[0]*dim # 更新後の代表点
+        for i in range(dim):
+            for docNo in clusters[clusterNo]:
+                center[i]+=wdMat[docNo][i]
+            center[i]/=len(clusters[clusterNo])
+        centers.append(center)
+    return centers
+
+# k-means法（初期代表点の文書番号を指定する）
+# (入力) wdMat: 単語文書行列, initDocs: 初期代表点とする文書番号のリスト
+# (出力) clusters: 各クラスタに割り当てられた文書, 繰り返し回数
+def runKmeans(wdMat, initDocs):
+    centers=[]
+    for docNo in initDocs:
+        centers.append(wdMat[docNo])
+    numIter=0
+    while(True):
+        numIter+=1
+        clusters=assignDocs(wdMat, centers)
+        newCenters=updateCenters(wdMat, clusters, centers)
+        if newCenters==centers:
+            break
+        centers=newCenters
+    return clusters, numIter
+
+# クラスタ割り当て結果を文書ごとのクラスタ番号のリストに変換する
+def toLabels(clusters, numDoc):
+    labels=[0]*numDoc
+    for clusterNo in range(len(clusters)):
+        for docNo in clusters[clusterNo]:
+            labels[docNo]=clusterNo
+    return labels
+
+# 2つのクラスタ割り当ての一致度（Rand指数）を計算する
+# 文書の組のうち「同じクラスタか否か」の判定が一致する組の割合（クラスタ番号の違いは問わない）
+def calcRandIndex(labels1, labels2):
+    num=len(labels1)
+    agree=0
+    total=0
+    for i in range(num):
+        for j in range(i+1, num):
+            if (labels1[i]==labels1[j])==(labels2[i]==labels2[j]):
+                agree+=1
+            total+=1
+    return agree/total
+
+
+# プログラムの実行開始ポイント
+# 乱数の種（データと初期代表点）を変えて複数回測定し、平均を表示する
+def main():
+    numDoc=200 # 文書数
+    dim=2000 # 語彙数（元の次元数）
+    k=5 # クラスタ数
+    targetDims=[16, 32, 64, 128] # 射影後の次元数
+    seeds=[0, 1, 2, 3, 4]
+
+    fullTime=0
+    fullRand=0 # 元の次元での結果と正解トピックのRand指数
+    projTime={}
+    agreeRand={} # 元の次元での結果とのRand指数
+    topicRand={} # 正解トピックとのRand指数
+    for targetDim in targetDims:
+        projTime[targetDim]=0
+        agreeRand[targetDim]=0
+        topicRand[targetDim]=0
+
+    for seed in seeds:
+        rng=random.Random(seed)
+        wdMat, topics=makeDocuments(numDoc, dim, k, 60, rng)
+        wdMat=regulateMat(wdMat)
+        initDocs=rng.sample(range(numDoc), k) # 元の次元と削減後で同じ文書を初期代表点にする
+
+        start=time.perf_counter()
+        clusters, numIter=runKmeans(wdMat, initDocs)
+        fullTime+=time.perf_counter()-start
+        fullLabels=toLabels(clusters, numDoc)
+        fullRand+=calcRandIndex(topics, fullLabels)
+
+        for targetDim in targetDims:
+            start=time.perf_counter()
+            wdMatProj=randomProjectMat(wdMat, targetDim, seed)
+            clusters, numIter=runKmeans(wdMatProj, initDocs)
+            projTime[targetDim]+=time.perf_counter()-start # 射影の時間も含める
+            labels=toLabels(clusters, numDoc)
+            agreeRand[targetDim]+=calcRandIndex(fullLabels, labels)
+            topicRand[targetDim]+=calcRandIndex(topics, labels)
+
+    num=len(seeds)
+    print('{:d}文書, 乱数の種{:d}通りの平均'.format(numDoc, num))
+    print('元の次元: {:d}次元 {:.3f}秒 正解トピックとのRand指数 {:.3f}'.format(dim, fullTime/num, fullRand/num))
+    for targetDim in targetDims:
+        print('射影後: {:d}次元 {:.3f}秒 高速化 {:.1f}倍 元の次元の結果とのRand指数 {:.3f} 正解トピックとのRand指数 {:.3f}'.format(
+            targetDim, projTime[targetDim]/num, fullTime/projTime[targetDim], agreeRand[targetDim]/num, topicRand[targetDim]/num))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+# ****************************************************************
+# k-NN法の学習データを削減する（Hartの圧縮NN法、Wilsonの編集法）プログラム
+# 情22-0419 藤里 和輝
+# ****************************************************************
+import random
+
+from kadai2 import LoadData, calcAllDistances, getTopM, estimateCategory
+
+# 以下、学習データ削減関連の関数の定義
+
+# k-NN法で1件の分類データのカテゴリを推定する
+# 学習データが空の場合は推定できないので-1を返す
+# (入力) vec: 分類データのベクトル, vecTrainingData: 学習データ, categoryTrainingData: 学習データのカテゴリ, categoryName: カテゴリ名のリスト, k: kの値
+# (出力) 推定結果（カテゴリ番号）
+def classify(vec, vecTrainingData, categoryTrainingData, categoryName, k):
+    if len(vecTrainingData)==0:
+        return -1
+    distanceList=calcAllDistances(vec, vecTrainingData)
+    topk=getTopM(distanceList, min(k, len(vecTrainingData)))
+    return estimateCategory(topk, categoryTrainingData, categoryName)
+
+# 選択した学習データ（index）だけを取り出す
+# (入力) selected: 残す学習データの番号のリスト, vecTrainingData: 学習データ, categoryTrainingData: 学習データのカテゴリ
+# (出力) 削減後の学習データ, 削減後の学習データのカテゴリ
+def selectTrainingData(selected, vecTrainingData, categoryTrainingData):
+    vecSelected=[]
+    categorySelected=[]
+    for i in selected:
+        vecSelected.append(vecTrainingData[i])
+        categorySelected.append(categoryTrainingData[i])
+    return vecSelected, categorySelected
+
+# Wilsonの編集法: 自分以外の学習データでk-NN識別して誤識別される学習データを取り除く
+# ただし、あるカテゴリの学習データがすべて取り除かれる場合は、そのカテゴリの学習データは残す
+# （そのカテゴリが二度と識別されなくなるのを防ぐため）
+# (入力) vecTrainingData: 学習データ, categoryTrainingData: 学習データのカテゴリ, categoryName: カテゴリ名のリスト, k: kの値
+# (出力) selected: 残す学習データの番号のリスト
+def editWilson(vecTrainingData, categoryTrainingData, categoryName, k):
+    num=len(vecTrainingData)
+    keep=[]
+    for i in range(num):
+        others=list(range(num))
+        others.remove(i)
+        vecOthers, categoryOthers=selectTrainingData(others, vecTrainingData, categoryTrainingData)
+        keep.append(classify(vecTrainingData[i], vecOthers, categoryOthers, categoryName, k)==categoryTrainingData[i])
+    kept=[0]*len(categoryName) # 各カテゴリで残る学習データ数
+    for i in range(num):
+        if keep[i]:
+            kept[categoryTrainingData[i]]+=1
+    selected=[]
+    for i in range(num):
+        if keep[i] or kept[categoryTrainingData[i]]==0:
+            selected.append(i)
+    return selected
+
+# Hartの圧縮NN法: 選択済みの学習データによるk-NN識別で誤識別される学習データを順に追加していく
+# 追加が起こらなくなるまで学習データ全体の走査を繰り返すので、結果はそのkでの識別と矛盾しない
+# (入力) vecTrainingData: 学習データ, categoryTrainingData: 学習データのカテゴリ, categoryName: カテゴリ名のリスト, k: kの値
+# (出力) selected: 残す学習データの番号のリスト
+def condenseHart(vecTrainingData, categoryTrainingData, categoryName, k):
+    num=len(vecTrainingData)
+    # 各カテゴリの最初の学習データから始める
+    selected=[]
+    seen=[]
+    for i in range(num):
+        if categoryTrainingData[i] not in seen:
+            seen.append(categoryTrainingData[i])
+            selected.append(i)
+    changed=True
+    while changed:
+        changed=False
+        for i in range(num):
+            if i in selected:
+                continue
+            vecSelected, categorySelected=selectTrainingData(selected, vecTrainingData, categoryTrainingData)
+            if classify(vecTrainingData[i], vecSelected, categorySelected, categoryName, k)!=categoryTrainingData[i]:
+                selected.append(i)
+                changed=True
+    selected.sort()
+    return selected
+
+# Wilsonの編集法で外れ値を取り除いてから、Hartの圧縮NN法で冗長な学習データを取り除く
+# (入力) vecTrainingData: 学習データ, categoryTrainingData: 学習データのカテゴリ, categoryName: カテゴリ名のリスト, k: kの値, edit: 編集法を行うか
+# (出力) selected: 残す学習データの番号のリスト, numEdited: 編集法の後の学習データ数
+def reduceTrainingData(vecTrainingData, categoryTrainingData, categoryName, k, edit=True):
+    if edit:
+        edited=editWilson(vecTrainingData, categoryTrainingData, categoryName, k)
+    else:
+        edited=list(range(len(vecTrainingData)))
+    vecEdited, categoryEdited=selectTrainingData(edited, vecTrainingData, categoryTrainingData)
+    condensed=condenseHart(vecEdited, categoryEdited, categoryName, k)
+    selected=[]
+    for i in condensed:
+        selected.append(edited[i])
+    return selected, len(edited)
+
+# 分類データの識別成功数を数える
+def countCorrect(vecDoc, categoryDoc, vecTrainingData, categoryTrainingData, categoryName, k):
+    correct_count=0
+    for i in range(len(vecDoc)):
+        if classify(vecDoc[i], vecTrainingData, categoryTrainingData, categoryName, k)==categoryDoc[i]:
+            correct_count=correct_count+1
+    return correct_count
+
+
+# プログラムの実行開始ポイント
+def main():
+    # 都道府県データの読み込み
+    prefName, prefAreaNo, prefLocation=LoadData()
+    # カテゴリ名
+    categoryName=['東北・北海道', '関東', '中部', '近畿', '中国', '四国', '九州・沖縄']
+
+    # 学習データとテストデータの分類
+    totalIndex=list(range(len(prefName))) # 47都道府県のindexリスト
+    testIndex=random.sample(totalIndex, 10) # テストデータとするindexのリスト
+    trainIndex=[]
+    for i in totalIndex:
+        if i not in testIndex:
+            trainIndex.append(i) # 学習データとするindexのリスト
+
+    categoryTrainingData=[]
+    vecTrainingData=[]
+    for i in trainIndex:
+        categoryTrainingData.append(prefAreaNo[i])
+        vecTrainingData.append(prefLocation[i])
+    vecDoc=[]
+    categoryDoc=[]
+    for i in testIndex:
+        vecDoc.append(prefLocation[i])
+        categoryDoc.append(prefAreaNo[i])
+
+    k=3 # 上位k個の文書で多数決を取る
+    # Wilsonの編集法を行うか
+    # （1地方あたりの県が少ないこのデータでは、境界付近の県が取り除かれて識別成功率が下がるため行わない）
+    edit=False
+
+    # 学習データの削減
+    selected, numEdited=reduceTrainingData(vecTrainingData, categoryTrainingData, categoryName, k, edit)
+    vecReduced, categoryReduced=selectTrainingData(selected, vecTrainingData, categoryTrainingData)
+
+    print('削減後の学習データ')
+    for i in selected:
+        print(prefName[trainIndex[i]]+'('+categoryName[categoryTrainingData[i]]+'地方)', end=' ')
+    print()
+
+    numTraining=len(vecTrainingData)
+    print('学習データ数: '+str(numTraining)+' → 編集後 '+str(numEdited)+' → 圧縮後 '+str(len(selected))+
+          ' (削減率 {:.1f}%)'.format(100*(1-len(selected)/numTraining)))
+
+    correctFull=countCorrect(vecDoc, categoryDoc, vecTrainingData, categoryTrainingData, categoryName, k)
+    correctReduced=countCorrect(vecDoc, categoryDoc, vecReduced, categoryReduced, categoryName, k)
+    print('識別成功率（全学習データ, k='+str(k)+'）：'+str(correctFull)+'/'+str(len(vecDoc)))
+    print('識別成功率（削減後, k='+str(k)+'）：'+str(correctReduced)+'/'+str(len(vecDoc)))
+    print('識別成功率の変化：'+str(correctReduced-correctFull))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,237 @@
+# ****************************************************
+# 重み付きコアセットを作成して、その上でk-means法を実行するプログラム
+# 情22-0419 藤里 和輝
+# ****************************************************
+import random
+import time
+
+import distance
+from kadai1 import assignDocs
+
+# 以下コアセット関連の関数
+# コアセットは (points: 特徴点のリスト, weights: 各特徴点の重みのリスト) の組で表す
+
+# 各特徴点に最も近い代表点の番号とその距離の2乗を求める
+# (入力) points: 特徴点のリスト, centers: 代表点のリスト
+# (出力) nearest: 最も近い代表点の番号のリスト, dist2: その距離の2乗のリスト
+def calcNearest(points, centers):
+    nearest=[]
+    dist2=[]
+    for p in points:
+        minNo=0
+        minDist=distance.calcDistance2(p, centers[0])
+        for clusterNo in range(1, len(centers)):
+            dist=distance.calcDistance2(p, centers[clusterNo])
+            if dist<minDist:
+                minDist=dist
+                minNo=clusterNo
+        nearest.append(minNo)
+        dist2.append(minDist)
+    return nearest, dist2
+
+# 重み付きk-means++法で代表点を選ぶ（距離の2乗×重みに比例する確率で次の代表点を選択）
+# (入力) points: 特徴点のリスト, weights: 重みのリスト, k: クラスタ数, rng: 乱数生成器
+# (出力) centers: 代表点のリスト
+def initCentersPlusPlus(points, weights, k, rng):
+    centers=[points[rng.choices(range(len(points)), weights=weights)[0]]]
+    dist2=[distance.calcDistance2(p, centers[0]) for p in points]
+    while len(centers)<k:
+        prob=[w*d for w, d in zip(weights, dist2)]
+        if sum(prob)==0: # すべての点が既存の代表点と一致している
+            break
+        p=points[rng.choices(range(len(points)), weights=prob)[0]]
+        centers.append(p)
+        for i in range(len(points)): # 最も近い代表点までの距離を更新
+            d=distance.calcDistance2(points[i], p)
+            if d<dist2[i]:
+                dist2[i]=d
+    return centers
+
+# 感度サンプリングによるコアセットの作成
+# k-means++で求めた粗い代表点を元に各点の感度（コストへの寄与の上限）を見積もり、
+# 感度に比例する確率でm個の点を抽出して重みを付け直す
+# (入力) points: 特徴点のリスト, weights: 重みのリスト, k: クラスタ数, m: コアセットの大きさ, rng: 乱数生成器
+# (出力) coresetPoints: コアセットの特徴点のリスト, coresetWeights: コアセットの重みのリスト
+def buildCoreset(points, weights, k, m, rng):
+    if len(points)<=m: # 既に十分小さい場合はそのまま返す
+        return list(points), list(weights)
+    seeds=initCentersPlusPlus(points, weights, k, rng)
+    nearest, dist2=calcNearest(points, seeds)
+    clusterWeight=[0]*len(seeds) # 各クラスタの重みの合計
+    totalCost=0
+    for i in range(len(points)):
+        clusterWeight[nearest[i]]+=weights[i]
+        totalCost+=weights[i]*dist2[i]
+    sensitivity=[]
+    for i in range(len(points)):
+        s=weights[i]/clusterWeight[nearest[i]]
+        if totalCost>0:
+            s+=weights[i]*dist2[i]/totalCost
+        sensitivity.append(s)
+    totalSensitivity=sum(sensitivity)
+    # 抽出確率q_iで選ばれた点の重みは w_i/(m*q_i) とする（同じ点が複数回選ばれたら重みを加算）
+    sampled={}
+    for i in rng.choices(range(len(points)), weights=sensitivity, k=m):
+        q=sensitivity[i]/totalSensitivity
+        sampled[i]=sampled.get(i, 0)+weights[i]/(m*q)
+    coresetPoints=[]
+    coresetWeights=[]
+    for i in sorted(sampled):
+        coresetPoints.append(points[i])
+        coresetWeights.append(sampled[i])
+    return coresetPoints, coresetWeights
+
+# 2つのコアセットを併合する（重み付き点集合の和集合）
+# (入力) coreset1, coreset2: (特徴点のリスト, 重みのリスト)
+# (出力) 併合されたコアセット
+def mergeCoresets(coreset1, coreset2):
+    return coreset1[0]+coreset2[0], coreset1[1]+coreset2[1]
+
+# データを1回だけ走査してコアセットを作成する（merge & reduce法）
+# チャンクごとにコアセットを作り、同じ段数のコアセット同士を併合して再度縮約する。
+# 各チャンクのコアセットは独立に作れるので、並列に作成してからmergeCoresetsで併合してもよい。
+# (入力) chunks: 特徴点のリストを順に返すイテラブル, k: クラスタ数, m: コアセットの大きさ, rng: 乱数生成器
+# (出力) コアセット (特徴点のリスト, 重みのリスト)
+def buildCoresetStream(chunks, k, m, rng):
+    levels=[] # levels[i]: i段目のコアセット（無ければNone）
+    for chunk in chunks:
+        coreset=buildCoreset(chunk, [1]*len(chunk), k, m, rng)
+        level=0
+        while level<len(levels) and levels[level] is not None:
+            merged=mergeCoresets(levels[level], coreset)
+            coreset=buildCoreset(merged[0], merged[1], k, m, rng)
+            levels[level]=None
+            level+=1
+        if level==len(levels):
+            levels.append(None)
+        levels[level]=coreset
+    result=([], [])
+    for coreset in levels:
+        if coreset is not None:
+            result=mergeCoresets(result, coreset)
+    return buildCoreset(result[0], result[1], k, m, rng)
+
+# データをn個ずつのチャンクに分ける
+def splitChunks(points, n):
+    for i in range(0, len(points), n):
+        yield points[i:i+n]
+
+# step 3. 代表点の更新（重み付き）
+# (入力) points: 特徴点のリスト, weights: 重みのリスト, clusters: 各クラスタに割り当てられた点, prevCenters: 前回の代表点
+# (出力) 更新された代表点（点が割り当てられなかったクラスタは前回の代表点のまま）
+def updateCentersWeighted(points, weights, clusters, prevCenters):
+    k=len(clusters)
+    dim=len(points[0]) # ベクトルの次元数
+    centers=[]
+    for clusterNo in range(k):
+        totalWeight=0
+        for docNo in clusters[clusterNo]:
+            totalWeight+=weights[docNo]
+        if totalWeight==0:
+            centers.append(prevCenters[clusterNo])
+            continue
+        center=[0]*dim # 更新後の代表点
+        for i in range(dim):
+            for docNo in clusters[clusterNo]:
+                center[i]+=weights[docNo]*points[docNo][i]
+            center[i]/=totalWeight
+        centers.append(center)
+    return centers
+
+# クラスタ内分散（重み付き）
+# (入力) points: 特徴点のリスト, weights: 重みのリスト, centers: 代表点のリスト, clusters: 各クラスタに割り当てられた点
+def calcIntraDistWeighted(points, weights, centers, clusters):
+    k=len(centers) # クラスタ数
+    sum=0
+    for i in range(k):
+        center=centers[i]
+        for docNo in clusters[i]:
+            sum+=weights[docNo]*distance.calcDistance2(center, points[docNo])
+    totalWeight=0
+    for w in weights:
+        totalWeight+=w
+    return sum/totalWeight
+
+# 重み付きk-means法
+# (入力) points: 特徴点のリスト, weights: 重みのリスト, k: クラスタ数, rng: 乱数生成器
+# (出力) centers: 代表点のリスト, clusters: 各クラスタに割り当てられた点
+def kmeansWeighted(points, weights, k, rng):
+    centers=initCentersPlusPlus(points, weights, k, rng)
+    while(True):
+        clusters=assignDocs(points, centers)
+        newCenters=updateCentersWeighted(points, weights, clusters, centers)
+        if newCenters==centers:
+            break
+        centers=newCenters
+    return centers, clusters
+
+# 初期値を変えて重み付きk-means法を複数回実行し、クラスタ内分散が最小の結果を返す
+# (入力) points: 特徴点のリスト, weights: 重みのリスト, k: クラスタ数, numRestart: 実行回数, rng: 乱数生成器
+# (出力) bestCenters: 代表点のリスト
+def kmeansBest(points, weights, k, numRestart, rng):
+    bestCenters=None
+    bestCost=None
+    for r in range(numRestart):
+        centers, clusters=kmeansWeighted(points, weights, k, rng)
+        cost=calcIntraDistWeighted(points, weights, centers, clusters)
+        if bestCost is None or cost<bestCost:
+            bestCost=cost
+            bestCenters=centers
+    return bestCenters
+
+# 人工データ（k個の正規分布の塊からなる2次元の点）を作成する
+# (入力) numDoc: 点の数, k: 塊の数, rng: 乱数生成器
+# (出力) points: 特徴点のリスト
+def makeBlobs(numDoc, k, rng):
+    means=[]
+    for i in range(k):
+        means.append([rng.uniform(-10, 10), rng.uniform(-10, 10)])
+    points=[]
+    for i in range(numDoc):
+        mean=means[rng.randrange(k)]
+        points.append([rng.gauss(mean[0], 1.5), rng.gauss(mean[1], 1.5)])
+    return points
+
+
+# プログラムの実行開始ポイント
+# コアセットの効果が分かるよう、k（8）に比べて十分大きなコアセット（400点）を作れる人工データを使う
+def main():
+    numDoc=5000 # データ数
+    k=8 # クラスタ数の設定
+    m=400 # コアセットの大きさ
+    chunkSize=1000 # 1チャンクあたりのデータ数
+    numRestart=5 # k-means法の実行回数（最良の結果を使う）
+    seeds=[0, 1, 2, 3, 4] # コアセット作成に使う乱数の種
+    rng=random.Random(0)
+    wdMat=makeBlobs(numDoc, k, rng)
+    ones=[1]*numDoc
+
+    # 全データでのk-means（numRestart回のうち最良の結果を基準にする）
+    start=time.perf_counter()
+    fullCenters=kmeansBest(wdMat, ones, k, numRestart, rng)
+    fullTime=time.perf_counter()-start
+    fullCost=calcIntraDistWeighted(wdMat, ones, fullCenters, assignDocs(wdMat, fullCenters))
+    print('データ数:'+str(numDoc)+' k='+str(k)+' コアセットの大きさ:'+str(m)+' 実行回数:'+str(numRestart))
+    print('全データでのクラスタ内分散:{:.4f} ({:.3f}秒)'.format(fullCost, fullTime))
+
+    # コアセット上でのk-means（乱数の種ごと）
+    ratios=[]
+    for seed in seeds:
+        rng=random.Random(seed)
+        start=time.perf_counter()
+        points, weights=buildCoresetStream(splitChunks(wdMat, chunkSize), k, m, rng)
+        coresetCenters=kmeansBest(points, weights, k, numRestart, rng)
+        coresetTime=time.perf_counter()-start
+        # コアセットで求めた代表点を全データで評価する
+        coresetCost=calcIntraDistWeighted(wdMat, ones, coresetCenters, assignDocs(wdMat, coresetCenters))
+        # 全データで求めた代表点について、コアセット上で見積もったコストと実際のコストを比べる
+        # （コアセットで求めた代表点で比べると、その点集合に合わせた分だけ見積もりが小さくなる）
+        estimatedCost=calcIntraDistWeighted(points, weights, fullCenters, assignDocs(points, fullCenters))
+        ratios.append(coresetCost/fullCost)
+        print('seed={:d}: コアセット{:d}点 クラスタ内分散:{:.4f} ({:.3f}秒, 高速化{:.1f}倍) 近似比:{:.4f} 見積もり/実際:{:.4f}'.format(
+            seed, len(points), coresetCost, coresetTime, fullTime/coresetTime, coresetCost/fullCost, estimatedCost/fullCost))
+
+    print('コストの近似比 平均:{:.4f} 最大:{:.4f}'.format(sum(ratios)/len(ratios), max(ratios)))
+
+if __name__ == "__main__":
+    main()
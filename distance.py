@@ -0,0 +1,302 @@
+# ****************************************************************
+# 特徴点間の距離を計算する関数をまとめたモジュール
+# 計算方法（バックエンド）は pure Python / NumPy / Numba から選べる
+# 情22-0419 藤里 和輝
+# ****************************************************************
+import math
+import os
+import random
+
+# 距離の種類
+# euclidean: 直線距離, sqeuclidean: 距離の2乗, cosine: コサイン距離(1-コサイン類似度),
+# manhattan: マンハッタン距離, haversine: 緯度経度[度]の2点間の大円距離[km]
+METRICS=['euclidean', 'sqeuclidean', 'cosine', 'manhattan', 'haversine']
+BACKENDS=['python', 'numpy', 'numba']
+
+EARTH_RADIUS=6371.0 # 地球の半径[km]
+
+_backend=None # 選択されたバックエンド（最初に距離を計算するときに決める）
+_backendName=None
+
+# 公開する関数名と距離の種類の対応
+# バックエンドを読み込んだら、これらの名前をバックエンドの関数に直接置き換える
+# （置き換え後は1回の関数呼び出しで距離が求まる。
+#   置き換えを反映させるため、呼び出し側は distance.calcDistance(...) のようにモジュール経由で呼ぶ）
+_PUBLIC={
+    'calcDistance': 'euclidean', # 2つの特徴点間の直線距離
+    'calcDistance2': 'sqeuclidean', # 2つの特徴点間の距離の2乗
+    'calcCosineDistance': 'cosine', # 2つの特徴点間のコサイン距離
+    'calcManhattanDistance': 'manhattan', # 2つの特徴点間のマンハッタン距離
+    'calcHaversineDistance': 'haversine'} # 緯度経度で表された2地点間の大円距離[km]
+
+
+# 以下、pure Pythonによる距離の計算（基準となる実装）
+
+# 直線距離とその2乗は最も多く呼ばれるので、呼び出しを重ねずにそれぞれループを書く
+def _euclideanPy(v1, v2):
+    sum2=0 # 各成分の差の二乗和
+    for i in range(len(v1)):
+        d=v1[i]-v2[i]
+        sum2+=d*d
+    return math.sqrt(sum2)
+
+def _sqeuclideanPy(v1, v2):
+    sum2=0 # 各成分の差の二乗和
+    for i in range(len(v1)):
+        d=v1[i]-v2[i]
+        sum2+=d*d
+    return sum2
+
+def _cosinePy(v1, v2):
+    dot=0
+    norm1=0
+    norm2=0
+    for a, b in zip(v1, v2):
+        dot+=a*b
+        norm1+=a*a
+        norm2+=b*b
+    if norm1==0 or norm2==0: # 零ベクトルとの類似度は0とする
+        return 1.0
+    return 1.0-dot/math.sqrt(norm1*norm2)
+
+def _manhattanPy(v1, v2):
+    sum1=0
+    for a, b in zip(v1, v2):
+        sum1+=abs(a-b)
+    return sum1
+
+def _haversinePy(v1, v2):
+    lat1=math.radians(v1[0])
+    lat2=math.radians(v2[0])
+    dLat=lat2-lat1
+    dLon=math.radians(v2[1]-v1[1])
+    h=math.sin(dLat/2)**2+math.cos(lat1)*math.cos(lat2)*math.sin(dLon/2)**2
+    return 2*EARTH_RADIUS*math.asin(min(1.0, math.sqrt(h)))
+
+def _loadPython():
+    return {
+        'euclidean': _euclideanPy,
+        'sqeuclidean': _sqeuclideanPy,
+        'cosine': _cosinePy,
+        'manhattan': _manhattanPy,
+        'haversine': _haversinePy}
+
+
+# 以下、NumPyによる距離の計算
+
+def _loadNumpy():
+    import numpy as np
+
+    def sqeuclidean(v1, v2):
+        d=np.asarray(v1, dtype=np.float64)-np.asarray(v2, dtype=np.float64)
+        return float(np.dot(d, d))
+
+    def euclidean(v1, v2):
+        return math.sqrt(sqeuclidean(v1, v2))
+
+    def cosine(v1, v2):
+        a=np.asarray(v1, dtype=np.float64)
+        b=np.asarray(v2, dtype=np.float64)
+        norm=np.linalg.norm(a)*np.linalg.norm(b)
+        if norm==0:
+            return 1.0
+        return float(1.0-np.dot(a, b)/norm)
+
+    def manhattan(v1, v2):
+        return float(np.abs(np.asarray(v1, dtype=np.float64)-np.asarray(v2, dtype=np.float64)).sum())
+
+    def haversine(v1, v2):
+        lat1, lon1=np.radians(np.asarray(v1[:2], dtype=np.float64))
+        lat2, lon2=np.radians(np.asarray(v2[:2], dtype=np.float64))
+        h=np.sin((lat2-lat1)/2)**2+np.cos(lat1)*np.cos(lat2)*np.sin((lon2-lon1)/2)**2
+        return float(2*EARTH_RADIUS*np.arcsin(min(1.0, np.sqrt(h))))
+
+    return {
+        'euclidean': euclidean,
+        'sqeuclidean': sqeuclidean,
+        'cosine': cosine,
+        'manhattan': manhattan,
+        'haversine': haversine}
+
+
+# 以下、Numba（JITコンパイル）による距離の計算
+
+def _loadNumba():
+    import numpy as np
+    from numba import njit
+
+    @njit(cache=True)
+    def sqeuclideanJit(a, b):
+        sum2=0.0
+        for i in range(a.shape[0]):
+            sum2+=(a[i]-b[i])*(a[i]-b[i])
+        return sum2
+
+    @njit(cache=True)
+    def cosineJit(a, b):
+        dot=0.0
+        norm1=0.0
+        norm2=0.0
+        for i in range(a.shape[0]):
+            dot+=a[i]*b[i]
+            norm1+=a[i]*a[i]
+            norm2+=b[i]*b[i]
+        if norm1==0.0 or norm2==0.0:
+            return 1.0
+        return 1.0-dot/math.sqrt(norm1*norm2)
+
+    @njit(cache=True)
+    def manhattanJit(a, b):
+        sum1=0.0
+        for i in range(a.shape[0]):
+            sum1+=abs(a[i]-b[i])
+        return sum1
+
+    @njit(cache=True)
+    def haversineJit(a, b):
+        lat1=math.radians(a[0])
+        lat2=math.radians(b[0])
+        dLat=lat2-lat1
+        dLon=math.radians(b[1]-a[1])
+        h=math.sin(dLat/2)**2+math.cos(lat1)*math.cos(lat2)*math.sin(dLon/2)**2
+        return 2*EARTH_RADIUS*math.asin(min(1.0, math.sqrt(h)))
+
+    # リストで渡された特徴点を配列に変換してからJIT関数を呼び出す
+    def wrap(func):
+        def distance(v1, v2):
+            if type(v1) is not np.ndarray or v1.dtype!=np.float64:
+                v1=np.asarray(v1, dtype=np.float64)
+            if type(v2) is not np.ndarray or v2.dtype!=np.float64:
+                v2=np.asarray(v2, dtype=np.float64)
+            return func(v1, v2)
+        return distance
+
+    sqeuclidean=wrap(sqeuclideanJit)
+    return {
+        'euclidean': lambda v1, v2: math.sqrt(sqeuclidean(v1, v2)),
+        'sqeuclidean': sqeuclidean,
+        'cosine': wrap(cosineJit),
+        'manhattan': wrap(manhattanJit),
+        'haversine': wrap(haversineJit)}
+
+
+_LOADERS={'python': _loadPython, 'numpy': _loadNumpy, 'numba': _loadNumba}
+
+
+# 使用するバックエンドを指定する
+# (入力) name: 'python', 'numpy', 'numba' のいずれか。Noneなら環境変数または既定値に戻す
+def setBackend(name):
+    global _backend, _backendName
+    if name is not None and name not in _LOADERS:
+        raise ValueError('unknown backend: '+str(name))
+    _backend=None
+    _backendName=name
+    _bindLazy()
+
+# 使用するバックエンドを返す
+# 最初に呼ばれたときに読み込む。指定が無い場合は環境変数 DISTANCE_BACKEND を参照し、
+# それも無ければ pure Python を使う（特徴点がリストで渡される場合、NumPy/Numbaは
+# 呼び出しごとの配列変換の方が高くつくため）。
+# 指定されたバックエンドが読み込めない（NumPy/Numbaが無い）場合も pure Python を使う
+# (出力) 距離の種類から関数への辞書
+def getBackend():
+    global _backend, _backendName
+    if _backend is not None:
+        return _backend
+    name=_backendName or os.environ.get('DISTANCE_BACKEND') or 'python'
+    if name not in _LOADERS:
+        raise ValueError('unknown backend: '+str(name))
+    try:
+        _backend=_LOADERS[name]()
+        _backendName=name
+    except ImportError:
+        _backend=_loadPython()
+        _backendName='python'
+    for funcName, metric in _PUBLIC.items():
+        globals()[funcName]=_backend[metric]
+    return _backend
+
+# 使用中のバックエンド名を返す
+def getBackendName():
+    getBackend()
+    return _backendName
+
+# 距離の種類に対応する関数を返す
+# (入力) metric: METRICSのいずれか
+# (出力) 2つの特徴点を受け取って距離を返す関数
+def getDistanceFunc(metric):
+    if metric not in METRICS:
+        raise ValueError('unknown metric: '+str(metric))
+    return getBackend()[metric]
+
+
+# 距離を計算する関数（calcDistanceなど）を、最初の呼び出しでバックエンドを読み込む関数にする
+def _bindLazy():
+    for funcName, metric in _PUBLIC.items():
+        globals()[funcName]=_makeLazy(metric)
+
+def _makeLazy(metric):
+    def lazy(v1, v2):
+        return getBackend()[metric](v1, v2)
+    return lazy
+
+_bindLazy()
+
+
+# 使用可能なすべてのバックエンドの計算結果を pure Python の結果と比較する
+# (入力) numTrials: 比較する特徴点の組の数, dim: 次元数, seed: 乱数の種
+# (出力) results: バックエンド名から最大誤差（使用できなければNone）への辞書
+def checkParity(numTrials=200, dim=12, seed=0):
+    rng=random.Random(seed)
+    pairs=[]
+    for i in range(numTrials):
+        v1=[rng.uniform(-10, 10) for j in range(dim)]
+        v2=[rng.uniform(-10, 10) for j in range(dim)]
+        pairs.append((v1, v2))
+    # 緯度経度は範囲内の値にする
+    locPairs=[]
+    for i in range(numTrials):
+        v1=[rng.uniform(-90, 90), rng.uniform(-180, 180)]
+        v2=[rng.uniform(-90, 90), rng.uniform(-180, 180)]
+        locPairs.append((v1, v2))
+    pairs.append(([0]*dim, [1]*dim)) # 零ベクトル
+    pairs.append(([3]*dim, [3]*dim)) # 同一点
+
+    reference=_loadPython()
+    results={}
+    for name in BACKENDS:
+        try:
+            backend=_LOADERS[name]()
+        except ImportError:
+            results[name]=None
+            continue
+        maxErr=0
+        for metric in METRICS:
+            for v1, v2 in (locPairs if metric=='haversine' else pairs):
+                expected=reference[metric](v1, v2)
+                err=abs(backend[metric](v1, v2)-expected)/max(1.0, abs(expected))
+                maxErr=max(maxErr, err)
+        results[name]=maxErr
+    return results
+
+
+# プログラムの実行開始ポイント（バックエンド間の計算結果の一致を確認する）
+def main():
+    tolerance=1e-9
+    ok=True
+    for name, maxErr in checkParity().items():
+        if maxErr is None:
+            print(name+': 使用不可（スキップ）')
+            continue
+        print(name+': 最大相対誤差 {:.3e}'.format(maxErr), end=' ')
+        if maxErr<=tolerance:
+            print('一致')
+        else:
+            print('不一致')
+            ok=False
+    print('使用するバックエンド: '+getBackendName())
+    if not ok:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
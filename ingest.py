@@ -0,0 +1,209 @@
+# ****************************************************************
+# 文書集合（ディレクトリまたはJSONLファイル）から単語文書行列を作成するプログラム
+# 文書を1件ずつ読み込み、特徴ハッシング（hashing vectorizer）で固定次元のベクトルにする
+# 語彙の辞書を作らないので、語彙数が増えても疎行列のメモリ使用量は非ゼロ要素数で抑えられる
+# （ただしregulateMatやk-means法に渡すときは 文書数×次元数 の密な行列に変換する）
+# 情22-0419 藤里 和輝
+# ****************************************************************
+import json
+import math
+import os
+import re
+import sys
+import time
+import tracemalloc
+import unicodedata
+import zlib
+
+# 日本語（ひらがな・カタカナ・漢字）の文字
+CJK_CHARS='\u3040-\u309f\u30a0-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\u3005\u3006'
+CJK_PATTERN=re.compile('['+CJK_CHARS+']+')
+# 日本語の文字の並び、またはそれ以外の単語構成文字（英数字、アクセント付きのラテン文字など）の並びを取り出す正規表現
+TOKEN_PATTERN=re.compile('['+CJK_CHARS+']+|[^\\W'+CJK_CHARS+']+')
+
+# 文書を1件ずつ読み込む
+# ディレクトリの場合は中のファイル1つを1文書、JSONLファイルの場合は1行を1文書とする
+# (JSONLの各行は {"id": 文書名, "text": 本文} の形式。idが無ければ行番号を文書名にする)
+# UTF-8で読めないファイル・行や、JSONとして読めない・"text"が無い行は読み飛ばし、
+# skippedが与えられていれば (ファイル名または行番号, 理由) を追加する
+# (入力) path: ディレクトリまたはJSONLファイルのパス, skipped: 読み飛ばした文書を記録するリスト
+# (出力) (文書名, 本文) を順に返すイテレータ
+def iterDocuments(path, skipped=None):
+    if skipped is None:
+        skipped=[]
+    if os.path.isdir(path):
+        for fileName in sorted(os.listdir(path)):
+            filePath=os.path.join(path, fileName)
+            if not os.path.isfile(filePath):
+                continue
+            f=open(filePath, encoding='utf-8')
+            try:
+                text=f.read()
+            except UnicodeDecodeError:
+                skipped.append((fileName, 'UTF-8として読めない'))
+                continue
+            finally:
+                f.close()
+            yield fileName, text
+    else:
+        f=open(path, 'rb') # 1行ずつUTF-8として読めるか確かめるため、バイト列として読む
+        lineNo=0
+        for rawLine in f:
+            lineNo+=1
+            try:
+                line=rawLine.decode('utf-8-sig') # 先頭のBOMは取り除く
+            except UnicodeDecodeError:
+                skipped.append((str(lineNo)+'行目', 'UTF-8として読めない'))
+                continue
+            if line.strip()=='':
+                continue
+            try:
+                doc=json.loads(line)
+            except ValueError:
+                skipped.append((str(lineNo)+'行目', 'JSONとして読めない'))
+                continue
+            if not isinstance(doc, dict) or not isinstance(doc.get('text'), str):
+                skipped.append((str(lineNo)+'行目', '"text"が無い'))
+                continue
+            yield str(doc.get('id', lineNo)), doc['text']
+        f.close()
+
+# 文書を単語（トークン）に分割する
+# 日本語（分かち書きされない文字列）は文字n-gram、それ以外は空白・記号で区切った単語にする
+# 全角英数字や半角カタカナはNFKC正規化で通常の文字にそろえる
+# (入力) text: 本文, n: 文字n-gramのn
+# (出力) tokens: トークンのリスト
+def tokenize(text, n=2):
+    tokens=[]
+    for run in TOKEN_PATTERN.findall(unicodedata.normalize('NFKC', text).lower()):
+        if not CJK_PATTERN.fullmatch(run):
+            tokens.append(run)
+        elif len(run)<=n:
+            tokens.append(run)
+        else:
+            for i in range(len(run)-n+1):
+                tokens.append(run[i:i+n])
+    return tokens
+
+# トークンを次元番号に変換する（プロセスによらず同じ値になるようにcrc32を使う）
+def hashToken(token, numFeature):
+    return zlib.crc32(token.encode('utf-8'))%numFeature
+
+# トークンのリストを疎ベクトル（次元番号→出現回数の辞書）にする
+# (入力) tokens: トークンのリスト, numFeature: ベクトルの次元数
+# (出力) vec: 疎ベクトル
+def hashVector(tokens, numFeature):
+    vec={}
+    for token in tokens:
+        j=hashToken(token, numFeature)
+        vec[j]=vec.get(j, 0)+1
+    return vec
+
+# 文書集合から疎な単語文書行列を作成する
+# トークンが1つも無い文書は正規化できないので読み飛ばす
+# (入力) documents: (文書名, 本文) のイテラブル, numFeature: ベクトルの次元数, n: 文字n-gramのn
+# (出力) docNames: 文書名のリスト, sparseMat: 疎ベクトルのリスト, df: 各次元の文書頻度, numToken: 総トークン数, numChar: 総文字数
+def buildSparseMat(documents, numFeature, n=2):
+    docNames=[]
+    sparseMat=[]
+    df=[0]*numFeature # 各次元が出現した文書数
+    numToken=0
+    numChar=0
+    for name, text in documents:
+        numChar+=len(text)
+        tokens=tokenize(text, n)
+        if len(tokens)==0:
+            continue
+        numToken+=len(tokens)
+        vec=hashVector(tokens, numFeature)
+        for j in vec:
+            df[j]+=1
+        docNames.append(name)
+        sparseMat.append(vec)
+    return docNames, sparseMat, df, numToken, numChar
+
+# TF-IDFによる重み付け（idf=log((1+文書数)/(1+文書頻度))+1）
+# (入力) sparseMat: 疎ベクトルのリスト, df: 各次元の文書頻度
+# (出力) 重み付けした疎ベクトルのリスト
+def applyTfidf(sparseMat, df):
+    numDoc=len(sparseMat)
+    idf=[]
+    for j in range(len(df)):
+        idf.append(math.log((1+numDoc)/(1+df[j]))+1)
+    sparseMatNew=[]
+    for vec in sparseMat:
+        vecNew={}
+        for j in vec:
+            vecNew[j]=vec[j]*idf[j]
+        sparseMatNew.append(vecNew)
+    return sparseMatNew
+
+# 疎ベクトルのリストを単語文書行列（リストのリスト）にする
+def toDenseMat(sparseMat, numFeature):
+    wdMat=[]
+    for vec in sparseMat:
+        row=[0]*numFeature
+        for j in vec:
+            row[j]=vec[j]
+        wdMat.append(row)
+    return wdMat
+
+# 文書集合を読み込んで単語文書行列を作成する（regulateMatやクラスタリングにそのまま渡せる）
+# regulateMatやk-means法はリストのリストを前提にしているので、最後にtoDenseMatで密な行列にする。
+# ここでメモリ使用量は 文書数×numFeature に比例するようになる（疎行列のまま扱えるのはTF-IDFまで）
+# (入力) path: ディレクトリまたはJSONLファイルのパス, numFeature: ベクトルの次元数, n: 文字n-gramのn, tfidf: TF-IDFで重み付けするか,
+#        skipped: 読み飛ばした文書を記録するリスト（iterDocumentsを参照）
+# (出力) docNames: 文書名のリスト, wdMat: 単語文書行列
+def loadWdMat(path, numFeature=1024, n=2, tfidf=True, skipped=None):
+    docNames, sparseMat, df, numToken, numChar=buildSparseMat(iterDocuments(path, skipped), numFeature, n)
+    if tfidf:
+        sparseMat=applyTfidf(sparseMat, df)
+    return docNames, toDenseMat(sparseMat, numFeature)
+
+
+# プログラムの実行開始ポイント（読み込みの処理速度とメモリ使用量を表示する）
+def main():
+    if len(sys.argv)<2:
+        print('使い方: python ingest.py <ディレクトリまたはJSONLファイル> [次元数]')
+        sys.exit(1)
+    path=sys.argv[1]
+    numFeature=1024 # ベクトルの次元数
+    if len(sys.argv)>=3:
+        numFeature=int(sys.argv[2])
+
+    # 疎行列の作成とTF-IDFまで
+    skipped=[] # 読み飛ばした文書
+    tracemalloc.start()
+    start=time.perf_counter()
+    docNames, sparseMat, df, numToken, numChar=buildSparseMat(iterDocuments(path, skipped), numFeature)
+    sparseMat=applyTfidf(sparseMat, df)
+    elapsed=time.perf_counter()-start
+    current, peak=tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    # kmeans.pyが使うloadWdMat全体（密な行列への変換を含む）
+    tracemalloc.start()
+    start=time.perf_counter()
+    docNames, wdMat=loadWdMat(path, numFeature)
+    elapsedDense=time.perf_counter()-start
+    current, peakDense=tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    numDoc=len(sparseMat)
+    nonzero=0
+    for vec in sparseMat:
+        nonzero+=len(vec)
+    print('文書数: '+str(numDoc)+' 総トークン数: '+str(numToken)+' 総文字数: '+str(numChar))
+    print('次元数: '+str(numFeature)+' 非ゼロ要素数: '+str(nonzero))
+    print('読み飛ばした文書数: '+str(len(skipped)))
+    for name, reason in skipped:
+        print('  '+name+': '+reason)
+    if numDoc==0:
+        return
+    print('疎行列+TF-IDF: {:.3f}秒 ({:.1f}文書/秒, {:.1f}トークン/秒) 最大メモリ使用量 {:.2f}MB'.format(
+        elapsed, numDoc/elapsed, numToken/elapsed, peak/1024/1024))
+    print('loadWdMat全体（密な行列に変換）: {:.3f}秒 ({:.1f}文書/秒) 最大メモリ使用量 {:.2f}MB'.format(
+        elapsedDense, numDoc/elapsedDense, peakDense/1024/1024))
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,8 @@
 import math
 import random
 
+import distance
+
 # ファイルからデータ（特徴ベクトルのリスト）を読み込む関数
 def LoadData():
     prefName=[] # 都道府県名のリスト
@@ -19,22 +21,6 @@ def LoadData():
     f.close()
     return prefName, prefLocation
 
-# 2つの特徴点間の直線距離を計算する関数
-def calcDistance(v1, v2):
-    sum2=0 # 各成分の差の二乗和
-    dim=len(v1) # 次元数
-    for i in range(dim):
-        sum2+=((v1[i]-v2[i])*(v1[i]-v2[i])) 
-    return math.sqrt(sum2)
-
-# 2つの特徴点間の距離の2乗を計算する関数
-def calcDistance2(v1, v2):
-    sum2=0 # 各成分の差の二乗和
-    dim=len(v1) # 次元数
-    for i in range(dim):
-        sum2+=((v1[i]-v2[i])*(v1[i]-v2[i])) 
-    return sum2
-
 # 単語文書行列の正規化
 def regulateMat(wdMat):
     numDoc=len(wdMat) # 文書数
@@ -92,10 +78,10 @@ def assignDocs(wdMat, centers):
     for docNo in range(numDoc):
         docVec=wdMat[docNo] # 文書ベクトル(=特徴点)
         assignedClusterNo=0 # 割り当てられたクラスタ番号(逐次更新される)
-        minDist=calcDistance(docVec, centers[0]) # 最小距離（逐次更新される）
+        minDist=distance.calcDistance(docVec, centers[0]) # 最小距離（逐次更新される）
         # k個の代表点との距離を順番に計算
         for clusterNo in range(k): 
-            dist=calcDistance(docVec, centers[clusterNo])
+            dist=distance.calcDistance(docVec, centers[clusterNo])
             if dist<=minDist:
                 minDist=dist
                 assignedClusterNo=clusterNo
@@ -153,7 +139,7 @@ def calcIntraDist(wdMat, centers, clusters):
         center=centers[i] # i番目のクラスタの代表点位置
         # numDoc=len(clusters[i]) # i番目のクラスタの所属文書数　(←この行は不要)
         for docNo in clusters[i]: # i 番目のクラスタの文書を順番に調べる
-            dist=calcDistance2(center, wdMat[docNo])
+            dist=distance.calcDistance2(center, wdMat[docNo])
             sum+=dist
     return sum/numDoc
 
@@ -166,7 +152,7 @@ def calcInterDist(centers):
         for j in range(k):
             if i>=j:
                 continue
-            sum+=calcDistance2(centers[i], centers[j])
+            sum+=distance.calcDistance2(centers[i], centers[j])
     # クラスタの組み合わせの数kC2=k(k-1)/2
     return sum/(k*(k-1)/2)
 
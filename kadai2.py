@@ -2,10 +2,11 @@
 # k-NN法で都道府県データをカテゴリ識別するプログラム
 # 情22-0419 藤里 和輝
 # ****************************************************************
-import math
 import sys
 import random
 
+import distance
+
 # ファイルから都道府県データを読み込む関数
 def LoadData():
     f=open('data2.txt')
@@ -21,14 +22,6 @@ def LoadData():
         prefLocation.append(loc) # 緯度経度データをを追加
     return prefName, prefAreaNo, prefLocation
 
-# 2つの特徴点間の直線距離を計算する関数
-def calcDistance(v1, v2):
-    sum2=0 # ベクトルの成分の差の二乗和
-    dim=len(v1) # 次元数
-    for i in range(dim):
-        sum2+=((v1[i]-v2[i])*(v1[i]-v2[i])) 
-    return math.sqrt(sum2)
-
 # 学習データの表示
 def printTrainingData(vecTrainingData, categoryTrainingData, prefName, trainIndex, categoryName):
     num=len(vecTrainingData) # num=len(categoryTrainingData)でも可
@@ -65,8 +58,8 @@ def calcAllDistances(vec, wdMat):
     numTrainingData=len(wdMat)
     distanceList=[] 
     for i in range(numTrainingData):
-        distance=calcDistance(vec, wdMat[i])
-        distanceList.append(distance)
+        dist=distance.calcDistance(vec, wdMat[i])
+        distanceList.append(dist)
     return distanceList
 
 # 距離リストを元にトップk個の学習データ（文書番号）リストを求める
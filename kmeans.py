@@ -4,22 +4,11 @@
 # ****************************************************************
 import math
 import random
+import sys
 
-# 2つの特徴点間の直線距離を計算する関数
-def calcDistance(v1, v2):
-    sum2=0 # 各成分の差の二乗和
-    dim=len(v1) # 次元数
-    for i in range(dim):
-        sum2+=((v1[i]-v2[i])*(v1[i]-v2[i])) 
-    return math.sqrt(sum2)
-
-# 2つの特徴点間の距離の2乗を計算する関数
-def calcDistance2(v1, v2):
-    sum2=0 # 各成分の差の二乗和
-    dim=len(v1) # 次元数
-    for i in range(dim):
-        sum2+=((v1[i]-v2[i])*(v1[i]-v2[i])) 
-    return sum2
+import distance
+from ingest import loadWdMat
+from projection import randomProjectMat
 
 # 単語文書行列の正規化
 def regulateMat(wdMat):
@@ -78,10 +67,10 @@ def assignDocs(wdMat, centers):
     for docNo in range(numDoc):
         docVec=wdMat[docNo] # 文書ベクトル(=特徴点)
         assignedClusterNo=0 # 割り当てられたクラスタ番号(逐次更新される)
-        minDist=calcDistance(docVec, centers[0]) # 最小距離（逐次更新される）
+        minDist=distance.calcDistance(docVec, centers[0]) # 最小距離（逐次更新される）
         # k個の代表点との距離を順番に計算
         for clusterNo in range(k): 
-            dist=calcDistance(docVec, centers[clusterNo])
+            dist=distance.calcDistance(docVec, centers[clusterNo])
             if dist<=minDist:
                 minDist=dist
                 assignedClusterNo=clusterNo
@@ -89,13 +78,16 @@ def assignDocs(wdMat, centers):
     return clusters
 
 # step 3. 代表点の更新
-# (入力) wdMat: 単語文書行列, clusters: 各クラスタに割り当てられた文書
-# (出力) 更新された代表点
-def updateCenters(wdMat, clusters):
+# (入力) wdMat: 単語文書行列, clusters: 各クラスタに割り当てられた文書, prevCenters: 前回の代表点
+# (出力) 更新された代表点（文書が割り当てられなかったクラスタは前回の代表点のまま）
+def updateCenters(wdMat, clusters, prevCenters):
     k=len(clusters)
     dim=len(wdMat[0]) # ベクトルの次元数
     centers=[]
     for clusterNo in range(k):
+        if len(clusters[clusterNo])==0: # 同じ内容の文書が初期代表点に選ばれると起こる
+            centers.append(prevCenters[clusterNo])
+            continue
         center=[0]*dim # 更新後の代表点
         for i in range(dim):
             for docNo in clusters[clusterNo]:
@@ -139,7 +131,7 @@ def calcIntraDist(wdMat, centers, clusters):
         center=centers[i] # i番目のクラスタの代表点位置
         # numDoc=len(clusters[i]) # i番目のクラスタの所属文書数　(←この行は不要)
         for docNo in clusters[i]: # i 番目のクラスタの文書を順番に調べる
-            dist=calcDistance2(center, wdMat[docNo])
+            dist=distance.calcDistance2(center, wdMat[docNo])
             sum+=dist
     return sum/numDoc
 
@@ -152,27 +144,59 @@ def calcInterDist(centers):
         for j in range(k):
             if i>=j:
                 continue
-            sum+=calcDistance2(centers[i], centers[j])
+            sum+=distance.calcDistance2(centers[i], centers[j])
     # クラスタの組み合わせの数kC2=k(k-1)/2
     return sum/(k*(k-1)/2)
 
 # プログラムの実行開始ポイント
-# 単語文書行列（文書ベクトルのリスト）の定義
-wdMat=[
-    [3, 7, 6, 3, 0, 0, 0, 0, 0, 0, 0, 0],
-    [3, 3, 0, 3, 9, 2, 0, 0, 0, 0, 0, 0],
-    [0, 0, 0, 0, 0, 1, 3, 6, 5, 9, 0, 0],
-    [0, 0, 0, 0, 0, 3, 0, 4, 6, 0, 5, 5]]
-
-print('文書ベクトル')
-printWordDocumentMatrix(wdMat) # 単語文書行列(文書ベクトルのリスト)の表示
-
 k=2 # クラスタ数の設定
+printVectors=True # 文書ベクトルや代表点を表示するか
+fromCorpus=len(sys.argv)>1 # 文書集合から単語文書行列を作成するか
+
+# 次元削減（ランダム射影）の設定
+projDim=0 # 射影後の次元数（0なら次元削減しない）
+projSeed=0 # 射影行列を生成する乱数の種
+
+if fromCorpus:
+    # 文書集合（ディレクトリまたはJSONLファイル）が指定された場合は、そこから単語文書行列を作成する
+    # python kmeans.py <ディレクトリまたはJSONLファイル>
+    skipped=[] # 読み込めずに読み飛ばした文書
+    docNames, wdMat=loadWdMat(sys.argv[1], skipped=skipped) # 特徴ハッシング(1024次元)+TF-IDF
+    for name, reason in skipped:
+        print('読み飛ばした文書 '+name+': '+reason)
+    if len(wdMat)<k: # 文書が無い（トークンを含まない文書だけの場合も含む）、またはクラスタ数より少ない
+        print('文書数('+str(len(wdMat))+')がクラスタ数('+str(k)+')より少ないため、クラスタリングできません')
+        sys.exit(1)
+    printVectors=False # 1024次元のベクトルは表示しても読めないので表示しない
+    print('文書')
+    for i in range(len(docNames)):
+        print('文書'+str(i+1)+': '+docNames[i])
+    print()
+else:
+    # 単語文書行列（文書ベクトルのリスト）の定義
+    wdMat=[
+        [3, 7, 6, 3, 0, 0, 0, 0, 0, 0, 0, 0],
+        [3, 3, 0, 3, 9, 2, 0, 0, 0, 0, 0, 0],
+        [0, 0, 0, 0, 0, 1, 3, 6, 5, 9, 0, 0],
+        [0, 0, 0, 0, 0, 3, 0, 4, 6, 0, 5, 5]]
+
+    print('文書ベクトル')
+    printWordDocumentMatrix(wdMat) # 単語文書行列(文書ベクトルのリスト)の表示
+
+# 文書集合から作成した場合や射影する場合は正規化する（正規化はここで1回だけ行う）
+if fromCorpus or projDim>0:
+    wdMat=regulateMat(wdMat)
+if projDim>0:
+    wdMat=randomProjectMat(wdMat, projDim, projSeed) # 正規化済みの行列を射影する
+    if printVectors:
+        print('ランダム射影後の文書ベクトル('+str(projDim)+'次元)')
+        printWordDocumentMatrix(wdMat)
 
 print('step 1. 代表点の初期化')
 centers=initCenters(wdMat,k)
-print('初期代表点')
-printCenters(centers)
+if printVectors:
+    print('初期代表点')
+    printCenters(centers)
 prevCenters=centers
 
 while(True):
@@ -181,8 +205,9 @@ while(True):
     printClusters(clusters)
 
     print('step 3. 代表点の更新')
-    centers=updateCenters(wdMat, clusters)
-    printCenters(centers)
+    centers=updateCenters(wdMat, clusters, prevCenters)
+    if printVectors:
+        printCenters(centers)
 
     if centers==prevCenters: # 前回の代表点位置と比較
         print('代表点が変化しなかったので処理を終了')
@@ -200,6 +225,9 @@ Sinter=calcInterDist(centers)
 print('クラスタ間分散:'+str(Sinter))
 
 # クラスタリング結果の評価値
-print('クラスタリング結果の評価値:'+str(Sinter/Sintra))
+if Sintra==0: # すべての文書が代表点と一致する（同じ内容の文書だけからなるクラスタ）
+    print('クラスタ内分散が0のため、クラスタリング結果の評価値は計算できません')
+else:
+    print('クラスタリング結果の評価値:'+str(Sinter/Sintra))
 
 
@@ -3,16 +3,9 @@
 # (c) Kansai University, 2024
 # ****************************************************************
 
-import math
 import sys
 
-# 2つの特徴点間の直線距離を計算する関数
-def calcDistance(v1, v2):
-    sum2=0 # ベクトルの成分の差の二乗和
-    dim=len(v1) # 次元数
-    for i in range(dim):
-        sum2+=((v1[i]-v2[i])*(v1[i]-v2[i])) 
-    return math.sqrt(sum2)
+import distance
 
 # 学習データの表示
 def printTrainingData(vecTrainingData, categoryTrainingData, categoryName):
@@ -48,8 +41,8 @@ def calcAllDistances(vec, wdMat):
     numTrainingData=len(wdMat)
     distanceList=[] 
     for i in range(numTrainingData):
-        distance=calcDistance(vec, wdMat[i])
-        distanceList.append(distance)
+        dist=distance.calcDistance(vec, wdMat[i])
+        distanceList.append(dist)
     return distanceList
 
 # 距離リストを元にトップk個の学習データ（文書番号）リストを求める
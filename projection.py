@@ -0,0 +1,55 @@
+# ****************************************************************
+# スパースなランダム射影（Achlioptas法）で文書ベクトルの次元を削減するモジュール
+# 射影行列は乱数の種から1行ずつ生成するので、行列全体を保存する必要はない
+# 情22-0419 藤里 和輝
+# ****************************************************************
+import math
+import random
+
+# 射影行列のj行目（元の次元jに対応する行）を生成する
+# 各成分は確率1/6で+s, 確率1/6で-s, 確率2/3で0 (s=sqrt(3/targetDim))
+# (入力) j: 元の次元の番号, targetDim: 射影後の次元数, seed: 乱数の種
+# (出力) row: 0でない成分の (射影後の次元番号, 値) のリスト
+def projectionRow(j, targetDim, seed):
+    rng=random.Random(str(seed)+'-'+str(j)) # 同じ(seed, j)からは常に同じ行が生成される
+    s=math.sqrt(3/targetDim)
+    row=[]
+    for t in range(targetDim):
+        r=rng.random()
+        if r<1/6:
+            row.append((t, s))
+        elif r<1/3:
+            row.append((t, -s))
+    return row
+
+# 単語文書行列をランダム射影する
+# 射影後も文書間の距離がおおよそ保たれる（Johnson-Lindenstraussの補題）
+# (入力) wdMat: 単語文書行列, targetDim: 射影後の次元数, seed: 乱数の種
+# (出力) wdMatNew: 射影後の単語文書行列
+def randomProjectMat(wdMat, targetDim, seed):
+    numDoc=len(wdMat) # 文書数
+    dim=len(wdMat[0]) # 次元数
+    wdMatNew=[]
+    for i in range(numDoc):
+        wdMatNew.append([0.0]*targetDim)
+    # 射影行列を1行ずつ生成し、その次元の値が0でない文書にだけ足し込む
+    for j in range(dim):
+        docs=[]
+        for i in range(numDoc):
+            if wdMat[i][j]!=0:
+                docs.append(i)
+        if len(docs)==0:
+            continue
+        row=projectionRow(j, targetDim, seed)
+        for i in docs:
+            x=wdMat[i][j]
+            vec=wdMatNew[i]
+            for t, r in row:
+                vec[t]+=x*r
+    return wdMatNew
+
+# 1つの文書ベクトルをランダム射影する（randomProjectMatと同じseedを使えば同じ空間に写る）
+# (入力) vec: 文書ベクトル, targetDim: 射影後の次元数, seed: 乱数の種
+# (出力) 射影後の文書ベクトル
+def randomProjectVec(vec, targetDim, seed):
+    return randomProjectMat([vec], targetDim, seed)[0]